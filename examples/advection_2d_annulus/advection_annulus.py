@@ -19,23 +19,34 @@ This is the simplest example that shows how to use a mapped grid in PyClaw.
 from __future__ import absolute_import
 import numpy as np
 
+# The Fortran kernel for the aux values is optional: build it with
+# "python setup.py build_ext -i" (or "make") in this directory.  If it is
+# not available, edge_velocities_and_area falls back to NumPy.
+try:
+    from clawpack.pyclaw.examples.advection_2d_annulus import edge_velocities
+    fortran_available = True
+except ImportError:
+    fortran_available = False
+
 def mapc2p_annulus(xc, yc):
     """
     Specifies the mapping to curvilinear coordinates.
 
     Inputs: c_centers = Computational cell centers
                  [array ([Xc1, Xc2, ...]), array([Yc1, Yc2, ...])]
+            The two arrays may have any shapes that broadcast together.
 
     Output: p_centers = Physical cell centers
-                 [array ([Xp1, Xp2, ...]), array([Yp1, Yp2, ...])]
-    """  
-    p_centers = []
-
+                 (array ([Xp1, Xp2, ...]), array([Yp1, Yp2, ...]))
+            Both arrays are views into a single freshly allocated buffer.
+    """
     # Polar coordinates (first coordinate = radius,  second coordinate = theta)
-    p_centers.append(xc[:]*np.cos(yc[:]))
-    p_centers.append(xc[:]*np.sin(yc[:]))
-    
-    return p_centers
+    p_centers = np.empty((2,)+np.broadcast(xc,yc).shape)
+    np.cos(yc, out=p_centers[0])
+    np.sin(yc, out=p_centers[1])
+    p_centers *= xc
+
+    return p_centers[0], p_centers[1]
 
 
 def qinit(state):
@@ -55,52 +66,90 @@ def qinit(state):
     theta2 = 0.    # theta-coordinate of the centers
 
     R, Theta = state.grid.p_centers
-    state.q[0,:,:] = A1*np.exp(-beta1*(np.square(R-r1) + np.square(Theta-theta1)))\
-                   + A2*np.exp(-beta2*(np.square(R-r2) + np.square(Theta-theta2)))
+    dR1 = R-r1; dTheta1 = Theta-theta1
+    dR2 = R-r2; dTheta2 = Theta-theta2
+    state.q[0,:,:] = A1*np.exp(-beta1*(dR1*dR1 + dTheta1*dTheta1))\
+                   + A2*np.exp(-beta2*(dR2*dR2 + dTheta2*dTheta2))
+
+
+# The aux values in the ghost cells depend only on the (fixed) mapped grid,
+# so they are computed on the first boundary fill and reused afterwards.
+_ghost_aux_cache = {}
+
+def _ghost_aux_key(grid,dim,num_ghost,side):
+    return (grid.mapc2p, tuple(grid.lower), tuple(grid.upper),
+            tuple(grid.num_cells), dim.name, num_ghost, side)
 
 
 def ghost_velocities_upper(state,dim,t,qbc,auxbc,num_ghost):
     """
     Set the velocities for the ghost cells outside the outer radius of the annulus.
     In the computational domain, these are the cells at the top of the grid.
+
+    Only valid for the radial dimension (dim is grid.dimensions[0]), which
+    is the only one given a custom aux boundary condition in setup().  This
+    is checked when the ghost values are first computed.
     """
     grid=state.grid
-    if dim == grid.dimensions[0]:
+    key = _ghost_aux_key(grid,dim,num_ghost,'upper')
+    if key not in _ghost_aux_cache:
+        if dim is not grid.dimensions[0]:
+            raise Exception('Custom BC for this boundary is not appropriate!')
         dx, dy = grid.delta
-        R_nodes,Theta_nodes = grid.p_nodes_with_ghost(num_ghost=2)
+        r_nodes = np.linspace(dim.upper,dim.upper+num_ghost*dx,num_ghost+1)
+        theta_nodes = grid.dimensions[1].nodes_with_ghost(num_ghost)
+        R_nodes,Theta_nodes = grid.mapc2p(r_nodes[:,np.newaxis],theta_nodes[np.newaxis,:])
 
-        auxbc[:,-num_ghost:,:] = edge_velocities_and_area(R_nodes[-num_ghost-1:,:],Theta_nodes[-num_ghost-1:,:],dx,dy)
+        _ghost_aux_cache[key] = edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy)
 
-    else:
-        raise Exception('Custom BC for this boundary is not appropriate!')
+    auxbc[:,-num_ghost:,:] = _ghost_aux_cache[key]
 
 
 def ghost_velocities_lower(state,dim,t,qbc,auxbc,num_ghost):
     """
     Set the velocities for the ghost cells outside the inner radius of the annulus.
     In the computational domain, these are the cells at the bottom of the grid.
+
+    Only valid for the radial dimension; see ghost_velocities_upper.
     """
     grid=state.grid
-    if dim == grid.dimensions[0]:
+    key = _ghost_aux_key(grid,dim,num_ghost,'lower')
+    if key not in _ghost_aux_cache:
+        if dim is not grid.dimensions[0]:
+            raise Exception('Custom BC for this boundary is not appropriate!')
         dx, dy = grid.delta
-        R_nodes,Theta_nodes = grid.p_nodes_with_ghost(num_ghost=2)
+        r_nodes = np.linspace(dim.lower-num_ghost*dx,dim.lower,num_ghost+1)
+        theta_nodes = grid.dimensions[1].nodes_with_ghost(num_ghost)
+        R_nodes,Theta_nodes = grid.mapc2p(r_nodes[:,np.newaxis],theta_nodes[np.newaxis,:])
 
-        auxbc[:,0:num_ghost,:] = edge_velocities_and_area(R_nodes[0:num_ghost+1,:],Theta_nodes[0:num_ghost+1,:],dx,dy)
+        _ghost_aux_cache[key] = edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy)
 
-    else:
-        raise Exception('Custom BC for this boundary is not appropriate!')
+    auxbc[:,0:num_ghost,:] = _ghost_aux_cache[key]
 
 
-def edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy):
+def edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy,kernel_language=None):
     """This routine fills in the aux arrays for the problem:
 
         aux[0,i,j] = u-velocity at left edge of cell (i,j)
         aux[1,i,j] = v-velocity at bottom edge of cell (i,j)
         aux[2,i,j] = physical area of cell (i,j) (relative to area of computational cell)
+
+    aux is returned as a double precision array, which is the type the
+    Fortran solvers expect.  It is stored in Fortran order, so the three
+    values for a cell are adjacent in memory.
+
+    kernel_language is 'Fortran' (the compiled edge_velocities module) or
+    'Python' (NumPy); by default Fortran is used if it has been built.
     """
+    if kernel_language is None:
+        kernel_language = 'Fortran' if fortran_available else 'Python'
+
+    if kernel_language == 'Fortran':
+        return edge_velocities.edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy)
+
     mx = R_nodes.shape[0]-1
     my = R_nodes.shape[1]-1
-    aux = np.empty((3,mx,my), order='F')
+    aux = np.empty((3,mx,my), dtype=np.float64, order='F')
 
     # Bottom-left corners
     Xp0 = R_nodes[:mx,:my]
@@ -118,29 +167,19 @@ def edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy):
     Xp3 = R_nodes[1:,:my]
     Yp3 = Theta_nodes[1:,:my]
 
-    # Compute velocity component
-    aux[0,:mx,:my] = (stream(Xp1,Yp1)- stream(Xp0,Yp0))/dy
-    aux[1,:mx,:my] = -(stream(Xp3,Yp3)- stream(Xp0,Yp0))/dx
+    # Compute velocity component from differences of the stream function
+    # psi = pi*(Xp**2 + Yp**2) (clockwise rotation; one full rotation
+    # corresponds to 1 (second)), with the difference of squares factored
+    aux[0,:mx,:my] = (np.pi/dy)*((Xp1-Xp0)*(Xp1+Xp0) + (Yp1-Yp0)*(Yp1+Yp0))
+    aux[1,:mx,:my] = -(np.pi/dx)*((Xp3-Xp0)*(Xp3+Xp0) + (Yp3-Yp0)*(Yp3+Yp0))
 
-    # Compute area of the physical element
-    area = 1./2.*( (Yp0+Yp1)*(Xp1-Xp0) +
-                   (Yp1+Yp2)*(Xp2-Xp1) +
-                   (Yp2+Yp3)*(Xp3-Xp2) +
-                   (Yp3+Yp0)*(Xp0-Xp3) )
-    
-    # Compute capa 
-    aux[2,:mx,:my] = area/(dx*dy)
+    # Compute area of the physical element: half the cross product
+    # of the diagonals (shoelace formula for a quadrilateral), relative
+    # to the area of the computational cell
+    aux[2,:mx,:my] = (0.5/(dx*dy))*((Xp0-Xp2)*(Yp3-Yp1) + (Xp1-Xp3)*(Yp0-Yp2))
 
     return aux
 
-    
-def stream(Xp,Yp):
-    """ 
-    Calculates the stream function in physical space.
-    Clockwise rotation. One full rotation corresponds to 1 (second).
-    """
-    return np.pi*(Xp**2 + Yp**2)
-
 
 def setup(use_petsc=False,outdir='./_output',solver_type='classic'):
     from clawpack import riemann
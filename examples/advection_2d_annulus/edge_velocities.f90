@@ -0,0 +1,51 @@
+! =====================================================
+subroutine edge_velocities_and_area(mx,my,xp,yp,dx,dy,aux)
+! =====================================================
+! Fills in the aux array for advection in the annulus:
+
+!       aux(1,i,j) = u-velocity at left edge of cell (i,j)
+!       aux(2,i,j) = v-velocity at bottom edge of cell (i,j)
+!       aux(3,i,j) = physical area of cell (i,j) (relative to dx*dy)
+
+! On input, xp and yp contain the physical coordinates of the cell
+! corners, so that cell (i,j) has corners (i-1:i, j-1:j).
+
+! The velocities are the differences of the stream function
+! pi*(x**2 + y**2) along the left and bottom edges, and the area is
+! half the cross product of the cell diagonals.
+
+    implicit none
+
+    integer, intent(in) :: mx, my
+    double precision, intent(in) :: xp(0:mx,0:my), yp(0:mx,0:my)
+    double precision, intent(in) :: dx, dy
+    double precision, intent(out) :: aux(3,mx,my)
+
+    integer :: i, j
+    double precision :: pi, u_scale, v_scale, capa_scale
+    double precision :: x0, y0, x1, y1, x2, y2, x3, y3
+
+    pi = 4.d0*datan(1.d0)
+    u_scale = pi/dy
+    v_scale = -pi/dx
+    capa_scale = 0.5d0/(dx*dy)
+
+    do j = 1, my
+        do i = 1, mx
+            ! Bottom-left, top-left, top-right and bottom-right corners
+            x0 = xp(i-1,j-1)
+            y0 = yp(i-1,j-1)
+            x1 = xp(i-1,j)
+            y1 = yp(i-1,j)
+            x2 = xp(i,j)
+            y2 = yp(i,j)
+            x3 = xp(i,j-1)
+            y3 = yp(i,j-1)
+
+            aux(1,i,j) = u_scale*((x1-x0)*(x1+x0) + (y1-y0)*(y1+y0))
+            aux(2,i,j) = v_scale*((x3-x0)*(x3+x0) + (y3-y0)*(y3+y0))
+            aux(3,i,j) = capa_scale*((x0-x2)*(y3-y1) + (x1-x3)*(y0-y2))
+        enddo
+    enddo
+
+end subroutine edge_velocities_and_area
@@ -1,12 +1,10 @@
-
-
 from __future__ import absolute_import
+import numpy as np
+
 def mapc2p(xc,yc):
     """
     Specifies the mapping to curvilinear coordinates    
     """
-    import numpy as np
-
     # Polar coordinates (x coordinate = radius,  y coordinate = theta)
     xp = xc * np.cos(yc)
     yp = xc * np.sin(yc)
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+
+# How to use this file
+# python setup.py build_ext -i
+
+from __future__ import absolute_import
+
+def configuration(parent_package='',top_path=None):
+    from numpy.distutils.misc_util import Configuration
+    config = Configuration('advection_2d_annulus', parent_package, top_path)
+
+    config.add_extension('edge_velocities',
+                         ['edge_velocities.f90'])
+
+    return config
+
+if __name__ == '__main__':
+    from numpy.distutils.core import setup
+    setup(**configuration(top_path='').todict())
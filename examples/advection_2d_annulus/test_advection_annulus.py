@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+import numpy as np
+
+def annulus_domain():
+    """Mapped domain used by the annulus example, without the solver setup"""
+    from clawpack import pyclaw
+    from .advection_annulus import mapc2p_annulus
+
+    r     = pyclaw.Dimension(0.2,1.0,40,name='r')
+    theta = pyclaw.Dimension(0.0,np.pi*2.0,120,name='theta')
+    domain = pyclaw.Domain([r,theta])
+    domain.grid.mapc2p = mapc2p_annulus
+    return domain
+
+
+def test_edge_velocities_kernels():
+    """The Fortran aux kernel agrees with the NumPy implementation"""
+    from . import advection_annulus
+
+    if not advection_annulus.fortran_available:
+        from nose import SkipTest
+        raise SkipTest("edge_velocities extension module is not built")
+
+    grid = annulus_domain().grid
+    dx, dy = grid.delta
+    R_nodes, Theta_nodes = grid.p_nodes_with_ghost(2)
+
+    expected = advection_annulus.edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy,
+                                                          kernel_language='Python')
+    test = advection_annulus.edge_velocities_and_area(R_nodes,Theta_nodes,dx,dy,
+                                                      kernel_language='Fortran')
+    assert test.shape == expected.shape
+    assert np.allclose(test, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_ghost_velocities():
+    """Aux ghost values match the ghosted grid and are reused on later fills"""
+    from clawpack import pyclaw
+    from . import advection_annulus
+
+    for num_ghost in (2,3):
+        state = pyclaw.State(annulus_domain(),1,3)
+        grid = state.grid
+        dim = grid.dimensions[0]
+        dx, dy = grid.delta
+
+        keys = [advection_annulus._ghost_aux_key(grid,dim,num_ghost,side)
+                for side in ('lower','upper')]
+        for key in keys:
+            advection_annulus._ghost_aux_cache.pop(key,None)
+
+        R_nodes, Theta_nodes = grid.p_nodes_with_ghost(num_ghost)
+        expected_lower = advection_annulus.edge_velocities_and_area(
+            R_nodes[:num_ghost+1,:],Theta_nodes[:num_ghost+1,:],dx,dy)
+        expected_upper = advection_annulus.edge_velocities_and_area(
+            R_nodes[-num_ghost-1:,:],Theta_nodes[-num_ghost-1:,:],dx,dy)
+
+        auxbc = np.empty([3]+[n+2*num_ghost for n in grid.num_cells], order='F')
+        for fill in range(2):
+            auxbc.fill(np.nan)
+            advection_annulus.ghost_velocities_lower(state,dim,0.,None,auxbc,num_ghost)
+            advection_annulus.ghost_velocities_upper(state,dim,0.,None,auxbc,num_ghost)
+
+            for key in keys:
+                assert key in advection_annulus._ghost_aux_cache
+            assert np.allclose(auxbc[:,:num_ghost,:], expected_lower,
+                               rtol=1e-12, atol=1e-12)
+            assert np.allclose(auxbc[:,-num_ghost:,:], expected_upper,
+                               rtol=1e-12, atol=1e-12)
+
+
+if __name__=="__main__":
+    import nose
+    nose.main()
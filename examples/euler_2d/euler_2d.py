@@ -20,6 +20,7 @@ Liska and Wendroff.
 This example shows how to use VisClaw's Iplot class for simple interactive plotting.
 """
 from __future__ import absolute_import
+import numpy as np
 from clawpack import pyclaw
 from clawpack import riemann
 from clawpack.riemann.euler_4wave_2D_constants import density, x_momentum, y_momentum, \
@@ -50,12 +51,26 @@ gamma = 1.4
 solution.problem_data['gamma']  = gamma
 
 # Set initial data
-xx,yy = domain.grid.p_centers
-l = xx<0.5; r = xx>=0.5; b = yy<0.5; t = yy>=0.5
-solution.q[density,...] = 2.*l*t + 1.*l*b + 1.*r*t + 3.*r*b
-solution.q[x_momentum,...] = 0.75*t - 0.75*b
-solution.q[y_momentum,...] = 0.5*l  - 0.5*r
-solution.q[energy,...] = 0.5*solution.q[density,...]*(solution.q[x_momentum,...]**2+solution.q[y_momentum,...]**2) + 1./(gamma-1.)
+# The quadrants meet at x = y = 0.5; ihalf and jhalf index the first cell
+# centers at or beyond that line
+q = solution.q
+ihalf = np.searchsorted(domain.grid.x.centers, 0.5)
+jhalf = np.searchsorted(domain.grid.y.centers, 0.5)
+q[density,:ihalf,jhalf:] = 2.
+q[density,:ihalf,:jhalf] = 1.
+q[density,ihalf:,jhalf:] = 1.
+q[density,ihalf:,:jhalf] = 3.
+q[x_momentum,:,jhalf:] = 0.75
+q[x_momentum,:,:jhalf] = -0.75
+q[y_momentum,:ihalf,:] = 0.5
+q[y_momentum,ihalf:,:] = -0.5
+work = np.empty(domain.grid.num_cells)
+np.multiply(q[x_momentum,...],q[x_momentum,...],out=q[energy,...])
+np.multiply(q[y_momentum,...],q[y_momentum,...],out=work)
+q[energy,...] += work
+q[energy,...] *= q[density,...]
+q[energy,...] *= 0.5
+q[energy,...] += 1./(gamma-1.)
 
 claw = pyclaw.Controller()
 claw.tfinal = 0.3
@@ -223,14 +223,15 @@ def qinit(state,mx,my):
     h0 = 8.e3         # Minimum fluid height at the poles        
     R = 4.0
 
-    # Compute the the physical coordinates of the cells' centerss
-    state.grid.compute_p_centers(recompute=True)
+    # Physical coordinates of the cells' centers (computed once and cached
+    # by the grid)
+    xp_centers, yp_centers, zp_centers = state.grid.p_centers
  
     for i in range(mx):
         for j in range(my):
-            xp = state.grid.p_centers[0][i][j]
-            yp = state.grid.p_centers[1][i][j]
-            zp = state.grid.p_centers[2][i][j]
+            xp = xp_centers[i,j]
+            yp = yp_centers[i,j]
+            zp = zp_centers[i,j]
 
             rad = np.maximum(np.sqrt(xp**2 + yp**2),1.e-6)
 
@@ -578,19 +579,13 @@ def plot_on_sphere():
 
         # Override default mapc2p function
         # ================================
-        patch.mapc2p = mapc2p_sphere_vectorized
+        patch.grid.mapc2p = mapc2p_sphere_vectorized
 
 
         # Compute the physical coordinates of each cell's centers
         # ======================================================
-        patch.compute_p_centers(recompute=True)
-        xp = patch._p_centers[0]
-        yp = patch._p_centers[1]
-        zp = patch._p_centers[2]
-
-        patch.compute_c_centers(recompute=True)
-        xc = patch._c_centers[0]
-        yc = patch._c_centers[1]
+        xp, yp, zp = patch.grid.p_centers
+        xc, yc = patch.grid.c_centers
         
         # Define arrays of conserved variables
         h = np.zeros((mx,my))